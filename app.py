@@ -1,25 +1,53 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import atexit
 import logging
+import queue
+import threading
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 import os
-import plotly.express as px
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Import utils
-from utils.cleaning import preprocess_teks, preprocess_teks_batch, init_dictionary
-from utils.predictor import predict_text, predict_batch, load_model, get_model_info
-from utils.scraper import scrape_youtube_comments, get_comment_texts
+from utils.cleaning import preprocess_teks_batch, init_dictionary
+from utils.predictor import predict_batch, load_model, get_model_info
+from utils.scraper import scrape_youtube_comments_iter, get_comment_texts
+
+def setup_logging():
+    """
+    Setup logging asynchronous: logger hanya memasukkan record ke antrian,
+    lalu thread QueueListener yang menulis ke app.log dan console.
+    Seperti basicConfig, tidak melakukan apa-apa jika root logger sudah punya handler
+    (Streamlit menjalankan ulang script ini di setiap rerun).
+    """
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler('app.log')
+    stream_handler = logging.StreamHandler()
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # QueueHandler sudah memformat pesan sebelum masuk antrian; formatter '%(message)s'
+    # mencegah basicConfig memasang BASIC_FORMAT sehingga prefix tidak tercetak dua kali
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Page config
@@ -33,6 +61,57 @@ os.environ["OMP_NUM_THREADS"] = "1"
 os.environ["TF_NUM_INTRAOP_THREADS"] = "1"
 os.environ["TF_NUM_INTEROP_THREADS"] = "1"
 
+# Ukuran chunk dan kapasitas antrian pipeline cleaning -> prediction
+PIPELINE_CHUNK_SIZE = 64
+PIPELINE_QUEUE_SIZE = 4
+# Ukuran chunk komentar YouTube yang diproses selagi scraping berjalan
+SCRAPE_CHUNK_SIZE = 20
+# Jumlah teks per forward pass model; teks sudah diurutkan per panjang di predict_batch
+PREDICT_BATCH_SIZE = 32
+
+# Cache cleaning/prediction disimpan per chunk pipeline, jadi jumlah entry harus
+# cukup untuk beberapa upload berukuran ribuan komentar
+CACHE_MAX_ENTRIES = 256
+# CSV hasil download berisi seluruh DataFrame, jadi cukup beberapa yang terakhir
+CSV_CACHE_MAX_ENTRIES = 8
+
+# Nama kolom komentar yang dikenali pada file CSV, sesuai urutan prioritas
+COMMENT_COLUMN_CANDIDATES = ('komentar', 'comment', 'text', 'teks')
+
+# Batas baris tabel yang dikirim ke browser; data lengkap tersedia lewat download CSV
+DISPLAY_MAX_ROWS = 500
+DEBUG_MAX_ROWS = 200
+
+# Map warna gradasi untuk setiap kategori metric box
+_GRADIENT_MAP = {
+    'primary': 'linear-gradient(1deg, #2E86C1 0%, #5DADE2 100%)',
+    'success': 'linear-gradient(1deg, #28B463 0%, #82E0AA 100%)',
+    'danger': 'linear-gradient(1deg, #CB4335 0%, #F1948A 100%)',
+    'warning': 'linear-gradient(1deg, #F1C40F 0%, #F9E79F 100%)',
+    'info': 'linear-gradient(1deg, #17A589 0%, #76D7C4 100%)',
+    None: 'linear-gradient(1deg, #34495E 0%, #85929E 100%)'
+}
+
+# Template HTML metric box, cukup dibangun sekali
+_METRIC_TEMPLATE = '''
+        <div style="
+            background: {bg};
+            padding:1em 1.5em;
+            border-radius:1em;
+            margin-bottom:0.5em;
+            box-shadow:0 2px 8px #0001;
+            display:flex;
+            flex-direction:column;
+            align-items:center;
+        ">
+            <div style="font-size:1.1em;color:#fff;opacity:0.85;">{icon_html}{label}</div>
+            <div style="font-size:2.2em;font-weight:bold;color:#fff;">{value}</div>
+            {delta_html}
+        </div>
+    '''
+_ICON_TEMPLATE = '<span style="font-size:1.3em;">{icon}</span> '
+_DELTA_TEMPLATE = '<div style="color:#fff;opacity:0.7;font-size:1em;">{delta}</div>'
+
 @st.cache_resource
 def init_model():
     """
@@ -65,37 +144,220 @@ def init_dictionary_cache():
         logger.error(f"❌ Error saat memuat dictionary: {e}")
         return False
 
+@st.cache_data(ttl=3600, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_clean(texts_tuple: tuple) -> List[str]:
+    """Isi cached_clean; melempar exception jika dictionary gagal dimuat agar tidak di-cache."""
+    return preprocess_teks_batch(list(texts_tuple), raise_errors=True)
+
+def cached_clean(texts_tuple: tuple) -> List[str]:
+    """
+    Preprocessing batch teks dengan cache Streamlit.
+    Rerun dengan data yang sama langsung memakai hasil sebelumnya. Hasil fallback
+    (dictionary gagal dimuat) tidak di-cache, sehingga klik berikutnya mencoba lagi.
+    """
+    try:
+        return _cached_clean(texts_tuple)
+    except Exception as e:
+        logger.error(f"❌ Preprocessing gagal, hasil tidak di-cache: {e}")
+        return preprocess_teks_batch(list(texts_tuple))
+
+@st.cache_data(ttl=3600, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_predict(cleaned_tuple: tuple, batch_size: int) -> List[Dict]:
+    """Isi cached_predict; melempar exception jika model atau prediksi gagal agar tidak di-cache."""
+    return predict_batch(list(cleaned_tuple), batch_size=batch_size, raise_errors=True)
+
+def cached_predict(cleaned_tuple: tuple, batch_size: int = PREDICT_BATCH_SIZE) -> List[Dict]:
+    """
+    Prediksi batch teks bersih dengan cache Streamlit.
+    Menekan tombol analisis lagi dengan data yang sama tidak menjalankan tokenisasi dan model ulang.
+    Hasil fallback saat prediksi gagal (OOM, error XLA, model gagal dimuat) tidak di-cache,
+    sehingga klik berikutnya mencoba lagi.
+    """
+    try:
+        return _cached_predict(cleaned_tuple, batch_size)
+    except Exception as e:
+        logger.error(f"❌ Prediksi gagal, hasil tidak di-cache: {e}")
+        return predict_batch(list(cleaned_tuple), batch_size=batch_size)
+
+def predict_unique(cleaned_texts: List[str], batch_size: int = PREDICT_BATCH_SIZE) -> List[Dict]:
+    """
+    Memprediksi hanya teks bersih yang unik, lalu memetakan hasilnya kembali ke urutan asli.
+    """
+    uniq = list(dict.fromkeys(cleaned_texts))
+    mapping = dict(zip(uniq, cached_predict(tuple(uniq), batch_size=batch_size)))
+    return [mapping[t] for t in cleaned_texts]
+
+def _put_until_stopped(out_queue: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Memasukkan item ke antrian terbatas, berhenti menunggu jika pipeline dihentikan.
+    """
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _iter_until_stopped(in_queue: queue.Queue, stop: threading.Event) -> Iterator:
+    """
+    Mengiterasi antrian sampai sentinel None diterima atau pipeline dihentikan.
+    """
+    while not stop.is_set():
+        try:
+            item = in_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is None:
+            return
+        yield item
+
+def _run_pipeline_stage(items: Iterable, func: Callable, out_queue: queue.Queue, stop: threading.Event, ctx):
+    """
+    Menjalankan func untuk setiap item di thread pekerja dan mengirim hasilnya ke out_queue.
+    Sentinel None selalu dikirim di akhir agar tahap berikutnya tahu input sudah habis.
+    """
+    # Thread pekerja butuh context agar st.cache_data dapat dipakai
+    add_script_run_ctx(threading.current_thread(), ctx)
+    try:
+        for item in items:
+            if stop.is_set() or not _put_until_stopped(out_queue, func(item), stop):
+                break
+    finally:
+        _put_until_stopped(out_queue, None, stop)
+
+def clean_and_predict(text_chunks: Iterable[List[str]], total: int, progress_bar, status_text) -> Tuple[List[str], List[str], List[Dict]]:
+    """
+    Menjalankan pengambilan teks, cleaning, dan prediksi secara overlap.
+    text_chunks boleh berupa generator (misal hasil scraping per halaman): thread pertama
+    mengiterasinya dan menyaring teks unik, thread kedua membersihkan teks unik baru,
+    sementara thread utama memprediksi chunk yang sudah bersih dan memperbarui progress.
+    Hasil teks unik disebar kembali ke urutan asli di akhir.
+    
+    Args:
+        text_chunks (Iterable[List[str]]): Chunk teks mentah secara berurutan
+        total (int): Perkiraan jumlah teks, hanya untuk progress bar
+        
+    Returns:
+        Tuple[List[str], List[str], List[Dict]]: Teks asli, teks bersih, dan hasil prediksi
+    """
+    texts: List[str] = []
+    # Deduplikasi: mapping[i] adalah indeks texts[i] di dalam daftar teks unik
+    uniq_idx: Dict[str, int] = {}
+    mapping: List[int] = []
+    cleaned_uniq: List[str] = []
+    results_uniq: List[Dict] = []
+    
+    def dedupe(chunk: List[str]) -> Tuple[int, List[str]]:
+        new_texts = []
+        for text in chunk:
+            idx = uniq_idx.get(text)
+            if idx is None:
+                idx = uniq_idx[text] = len(uniq_idx)
+                new_texts.append(text)
+            mapping.append(idx)
+        texts.extend(chunk)
+        return len(texts), new_texts
+    
+    def clean(item: Tuple[int, List[str]]) -> Tuple[int, List[str]]:
+        seen, new_texts = item
+        return seen, cached_clean(tuple(new_texts)) if new_texts else []
+    
+    new_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    cleaned_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    ctx = get_script_run_ctx()
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fetcher = executor.submit(_run_pipeline_stage, text_chunks, dedupe, new_queue, stop, ctx)
+        cleaner = executor.submit(_run_pipeline_stage, _iter_until_stopped(new_queue, stop), clean, cleaned_queue, stop, ctx)
+        try:
+            for seen, cleaned_new in iter(cleaned_queue.get, None):
+                if cleaned_new:
+                    cleaned_uniq.extend(cleaned_new)
+                    results_uniq.extend(predict_unique(cleaned_new))
+                
+                progress_bar.progress(min(seen / max(total, 1), 1.0))
+                status_text.text(f"🔄 Membersihkan teks dan melakukan prediksi... ({seen}/{total} komentar)")
+        finally:
+            # Hentikan thread pekerja jika thread utama berhenti lebih awal
+            stop.set()
+        fetcher.result()
+        cleaner.result()
+    
+    # Sebar hasil teks unik kembali ke urutan asli
+    cleaned_comments = [cleaned_uniq[m] for m in mapping]
+    results = [results_uniq[m] for m in mapping]
+    return texts, cleaned_comments, results
+
+def format_confidence_column(confidence: pd.Series) -> pd.Series:
+    """
+    Memformat kolom confidence numerik menjadi persentase secara vectorized.
+    """
+    return (confidence * 100).round(2).astype(str) + '%'
+
+def build_results_df(texts: List[str], cleaned_texts: List[str], results: List[Dict],
+                     text_columns: Tuple[str, str] = ('Teks Asli', 'Teks Bersih'),
+                     format_confidence: bool = True) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Menyusun DataFrame hasil analisis sekaligus menghitung jumlah judi dan normal
+    dalam satu kali iterasi atas hasil prediksi.
+    Jika format_confidence False, kolom Confidence tetap numerik (misal untuk filter threshold).
+    Prediksi error (-1) tidak ikut dihitung.
+    
+    Returns:
+        Tuple[pd.DataFrame, int, int]: (results_df, judi_count, normal_count)
+    """
+    labels, confs, preds = [], [], []
+    add_label, add_conf, add_pred = labels.append, confs.append, preds.append
+    judi_count = normal_count = 0
+    for r in results:
+        add_label(r['label'])
+        add_conf(r['confidence'])
+        p = r['prediction']
+        add_pred(p)
+        if p == 1:
+            judi_count += 1
+        elif p == 0:
+            normal_count += 1
+    
+    confidence = pd.Series(confs, dtype='float64')
+    results_df = pd.DataFrame({
+        text_columns[0]: texts,
+        text_columns[1]: cleaned_texts,
+        'Label': labels,
+        'Confidence': format_confidence_column(confidence) if format_confidence else confidence,
+        'Prediction': preds
+    })
+    return results_df, judi_count, normal_count
+
+@st.cache_data(ttl=3600, max_entries=CSV_CACHE_MAX_ENTRIES, show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialisasi DataFrame ke CSV dengan cache, agar tidak diulang di setiap rerun.
+    """
+    return df.to_csv(index=False).encode('utf-8')
+
+def show_limited_dataframe(df: pd.DataFrame, max_rows: int, downloadable: bool = True):
+    """
+    Menampilkan maksimal max_rows baris agar payload ke browser tetap kecil.
+    """
+    st.dataframe(df.head(max_rows), use_container_width=True, height=400)
+    if len(df) > max_rows:
+        hint = " — unduh CSV untuk semua" if downloadable else ""
+        st.caption(f"Menampilkan {max_rows} dari {len(df)} baris{hint}")
+
 def styled_metric(label, value, delta=None, color=None, icon=None):
     """
     Custom styled metric box menggunakan gradasi warna pada background.
     """
-    # Map warna gradasi untuk setiap kategori
-    gradient_map = {
-        'primary': 'linear-gradient(1deg, #2E86C1 0%, #5DADE2 100%)',
-        'success': 'linear-gradient(1deg, #28B463 0%, #82E0AA 100%)',
-        'danger': 'linear-gradient(1deg, #CB4335 0%, #F1948A 100%)',
-        'warning': 'linear-gradient(1deg, #F1C40F 0%, #F9E79F 100%)',
-        'info': 'linear-gradient(1deg, #17A589 0%, #76D7C4 100%)',
-        None: 'linear-gradient(1deg, #34495E 0%, #85929E 100%)'
-    }
-    box_gradient = gradient_map.get(color, gradient_map[None])
-    icon_html = f'<span style="font-size:1.3em;">{icon}</span> ' if icon else ''
-    st.markdown(f'''
-        <div style="
-            background: {box_gradient};
-            padding:1em 1.5em;
-            border-radius:1em;
-            margin-bottom:0.5em;
-            box-shadow:0 2px 8px #0001;
-            display:flex;
-            flex-direction:column;
-            align-items:center;
-        ">
-            <div style="font-size:1.1em;color:#fff;opacity:0.85;">{icon_html}{label}</div>
-            <div style="font-size:2.2em;font-weight:bold;color:#fff;">{value}</div>
-            {f'<div style="color:#fff;opacity:0.7;font-size:1em;">{delta}</div>' if delta else ''}
-        </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_METRIC_TEMPLATE.format_map({
+        'bg': _GRADIENT_MAP.get(color, _GRADIENT_MAP[None]),
+        'icon_html': _ICON_TEMPLATE.format(icon=icon) if icon else '',
+        'label': label,
+        'value': value,
+        'delta_html': _DELTA_TEMPLATE.format(delta=delta) if delta else ''
+    }), unsafe_allow_html=True)
 
 def main():
     """Fungsi utama aplikasi"""
@@ -163,12 +425,12 @@ def single_comment_page():
                     logger.info("Memulai analisis single komentar")
                     
                     # Cleaning
-                    cleaned_comment = preprocess_teks(comment)
+                    cleaned_comment = cached_clean((comment,))[0]
                     logger.info(f"Teks asli: {comment[:100]}...")
                     logger.info(f"Teks bersih: {cleaned_comment[:100]}...")
                     
                     # Prediction
-                    result = predict_text(cleaned_comment)
+                    result = cached_predict((cleaned_comment,))[0]
                     
                     # Tampilkan hasil dengan metric box custom
                     st.success("✅ Analisis selesai!")
@@ -206,31 +468,50 @@ def csv_input_page():
     uploaded_file = st.file_uploader(
         "Pilih file CSV:",
         type=['csv'],
-        help="File CSV harus memiliki kolom 'komentar' atau 'comment'"
+        help="File CSV harus memiliki kolom 'komentar', 'comment', 'text' atau 'teks' (tidak case-sensitive)"
     )
     
     if uploaded_file is not None:
         try:
-            # Read CSV
-            df = pd.read_csv(uploaded_file, dtype=str)
-            st.success(f"✅ File berhasil diupload! ({len(df)} baris)")
+            # Baca header saja untuk mendeteksi kolom komentar
+            header = pd.read_csv(uploaded_file, nrows=0).columns
+            uploaded_file.seek(0)
             
-            # Check column
-            comment_column = None
-            for col in ['komentar', 'comment', 'text', 'teks']:
-                if col in df.columns:
-                    comment_column = col
-                    break
+            # Check column (case-insensitive, urutan prioritas mengikuti COMMENT_COLUMN_CANDIDATES)
+            cols_lower = {col.lower(): col for col in header}
+            comment_column = next((cols_lower[col] for col in COMMENT_COLUMN_CANDIDATES if col in cols_lower), None)
             
             if comment_column is None:
                 st.error("❌ Kolom 'komentar' tidak ditemukan dalam file CSV!")
-                st.write("Kolom yang tersedia:", list(df.columns))
+                st.write("Kolom yang tersedia:", list(header))
                 return
             
+            # Read CSV, hanya kolom komentar dengan pyarrow (multi-threaded).
+            # Kolom diparse langsung sebagai string agar '007', '1.50' atau 'true' tidak
+            # diubah dan kolom angka dengan sel kosong tidak gagal dikonversi
+            # (engine='pyarrow' di pd.read_csv menebak tipe dulu baru meng-cast dtype)
+            # Komentar multi-baris (newline di dalam sel bertanda kutip) harus didukung
+            try:
+                table = pa_csv.read_csv(
+                    uploaded_file,
+                    parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                    convert_options=pa_csv.ConvertOptions(
+                        include_columns=[comment_column],
+                        column_types={comment_column: pa.string()}
+                    )
+                )
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            except pa.ArrowInvalid as e:
+                # Misalnya jumlah kolom tiap baris tidak sama; parser pandas lebih toleran
+                logger.warning(f"pyarrow gagal membaca CSV, memakai parser pandas: {e}")
+                uploaded_file.seek(0)
+                df = pd.read_csv(uploaded_file, usecols=[comment_column], dtype=str, keep_default_na=False)
+            st.success(f"✅ File berhasil diupload! ({len(df)} baris)")
+            
             st.info(f"📋 Menggunakan kolom: '{comment_column}'")
             
-            # Hanya ambil kolom yang diperlukan dan ubah ke string
-            comments = df[comment_column].astype(str).tolist()
+            # Hanya ambil kolom yang diperlukan, ubah ke string dan handle NaN (vectorized)
+            comments = df[comment_column].fillna("").astype(str).tolist()
             
             # Preview data
             with st.expander("👀 Preview Data"):
@@ -253,61 +534,26 @@ def csv_input_page():
                         # Get comments
                         comments = comments[:max_comments]
                         
-                        # Progress bar untuk cleaning
+                        # Progress bar untuk cleaning dan prediction
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
-                        # Cleaning dengan batch processing
-                        status_text.text("🔄 Membersihkan teks...")
-                        cleaned_comments = []
-                        
-                        # Process dalam batch untuk efisiensi
-                        batch_size = 10  # Kurangi batch size untuk progress yang lebih halus
-                        total_batches = (len(comments) + batch_size - 1) // batch_size
-                        
-                        for i in range(0, len(comments), batch_size):
-                            batch = comments[i:i+batch_size]
-                            # Convert to string and handle NaN
-                            batch_texts = [str(comment) if pd.notna(comment) else "" for comment in batch]
-                            cleaned_batch = preprocess_teks_batch(batch_texts)
-                            cleaned_comments.extend(cleaned_batch)
-                            
-                            # Update progress dengan perhitungan yang lebih akurat
-                            current_batch = (i // batch_size) + 1
-                            progress = current_batch / total_batches
-                            progress_bar.progress(progress)
-                            
-                            # Update status text
-                            status_text.text(f"🔄 Membersihkan teks... ({current_batch}/{total_batches} batch)")
-                        
-                        progress_bar.progress(1.0)
-                        status_text.text("✅ Cleaning selesai!")
-                        
-                        # Progress bar untuk prediction
-                        status_text.text("🤖 Melakukan prediksi...")
-                        progress_bar.progress(0)
-                        
-                        # Prediction dengan batch processing dan batch_size kecil
-                        results = predict_batch(cleaned_comments, batch_size=16)
+                        # Cleaning dan prediction berjalan overlap per chunk
+                        status_text.text("🔄 Membersihkan teks dan melakukan prediksi...")
+                        comment_chunks = (comments[i:i+PIPELINE_CHUNK_SIZE] for i in range(0, len(comments), PIPELINE_CHUNK_SIZE))
+                        _, cleaned_comments, results = clean_and_predict(
+                            comment_chunks, len(comments), progress_bar, status_text
+                        )
                         
                         progress_bar.progress(1.0)
                         status_text.text("✅ Prediksi selesai!")
                         
                         # Create results dataframe
-                        results_df = pd.DataFrame({
-                            'Teks Asli': comments,
-                            'Teks Bersih': cleaned_comments,
-                            'Label': [r['label'] for r in results],
-                            'Confidence': [f"{r['confidence']:.2%}" for r in results],
-                            'Prediction': [r['prediction'] for r in results]
-                        })
+                        results_df, judi_count, normal_count = build_results_df(comments, cleaned_comments, results)
                         
                         # Display results
                         st.success("✅ Analisis selesai!")
                         
-                        # Statistics
-                        judi_count = sum(1 for r in results if r['prediction'] == 1)
-                        normal_count = sum(1 for r in results if r['prediction'] == 0)
                         
                         col1, col2, col3 = st.columns(3)
                         with col1:
@@ -317,26 +563,26 @@ def csv_input_page():
                         with col3:
                             styled_metric("Komentar Normal", normal_count, color='success', icon='✅')
                         
-                        # Chart visualisasi
-                        chart_df = pd.DataFrame({
-                            'Kategori': ['Judi', 'Normal'],
-                            'Jumlah': [judi_count, normal_count]
-                        })
+                        # Chart visualisasi langsung dari nilai mentah, tanpa DataFrame perantara
+                        kategori = ['Judi', 'Normal']
+                        jumlah = [judi_count, normal_count]
                         st.markdown("### Visualisasi Hasil")
+                        import plotly.express as px  # Lazy import, hanya halaman dengan chart yang membutuhkan
                         col_chart1, col_chart2 = st.columns(2)
                         with col_chart1:
-                            fig_pie = px.pie(chart_df, names='Kategori', values='Jumlah', title='Distribusi Komentar')
+                            fig_pie = px.pie(names=kategori, values=jumlah, title='Distribusi Komentar')
                             st.plotly_chart(fig_pie, use_container_width=True)
                         with col_chart2:
-                            fig_bar = px.bar(chart_df, x='Kategori', y='Jumlah', color='Kategori', title='Jumlah Komentar per Kategori', text='Jumlah')
+                            fig_bar = px.bar(x=kategori, y=jumlah, color=kategori, text=jumlah, title='Jumlah Komentar per Kategori',
+                                             labels={'x': 'Kategori', 'y': 'Jumlah', 'color': 'Kategori'})
                             st.plotly_chart(fig_bar, use_container_width=True)
                         
                         # Results table
                         st.subheader("📋 Hasil Analisis")
-                        st.dataframe(results_df)
+                        show_limited_dataframe(results_df, DISPLAY_MAX_ROWS)
                         
                         # Download results
-                        csv = results_df.to_csv(index=False)
+                        csv = to_csv_bytes(results_df)
                         st.download_button(
                             label="📥 Download Hasil CSV",
                             data=csv,
@@ -384,165 +630,157 @@ def youtube_input_page():
     
     if st.button("🔍 Analisis Komentar YouTube", type="primary"):
         if youtube_url.strip():
-            with st.spinner("Sedang mengambil komentar dari YouTube..."):
-                try:
-                    # Logging
-                    logger.info(f"Memulai scraping YouTube: {youtube_url}")
-                    
-                    # Scrape comments
-                    result = scrape_youtube_comments(youtube_url, max_comments)
-                    
-                    if result['success']:
-                        st.toast("✅ Berhasil mengambil komentar dari YouTube!")
-                        
-                        # Video info
-                        video_info = result['video_info']
-                        st.subheader("📺 Informasi Video")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write(f"**Judul:** {video_info['title']}")
-                            st.write(f"**Channel:** {video_info['channel']}")
-                        with col2:
-                            st.write(f"**Views:** {video_info['view_count']}")
-                            st.write(f"**Komentar:** {video_info['comment_count']}")
-                        
-                        # Get comment texts
-                        comment_texts = [comment['text'] for comment in result['comments']]
-                        
-                        # Progress bar untuk cleaning
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Cleaning dengan batch processing
-                        status_text.text("🔄 Membersihkan teks...")
-                        cleaned_comments = []
+            yt_cache = st.session_state.get('yt_cache', {})
+            if yt_cache.get('url') == youtube_url and yt_cache.get('max') == max_comments:
+                logger.info(f"Memakai hasil analisis YouTube dari session state: {youtube_url}")
+            else:
+                with st.spinner("Sedang mengambil komentar dari YouTube..."):
+                    try:
+                        # Logging
+                        logger.info(f"Memulai scraping YouTube: {youtube_url}")
                         
-                        # Process dalam batch untuk efisiensi
-                        batch_size = 10  # Kurangi batch size untuk progress yang lebih halus
-                        total_batches = (len(comment_texts) + batch_size - 1) // batch_size
+                        # Scrape comments
+                        # Komentar diambil per chunk selagi chunk sebelumnya dibersihkan dan diprediksi
+                        result = scrape_youtube_comments_iter(youtube_url, max_comments, chunk_size=SCRAPE_CHUNK_SIZE)
                         
-                        for i in range(0, len(comment_texts), batch_size):
-                            batch = comment_texts[i:i+batch_size]
-                            cleaned_batch = preprocess_teks_batch(batch)
-                            cleaned_comments.extend(cleaned_batch)
+                        if result['success']:
+                            # Get comment texts
+                            text_chunks = ([comment.text for comment in chunk] for chunk in result['comment_chunks'])
                             
-                            # Update progress dengan perhitungan yang lebih akurat
-                            current_batch = (i // batch_size) + 1
-                            progress = current_batch / total_batches
-                            progress_bar.progress(progress)
+                            # Progress bar untuk scraping, cleaning dan prediction
+                            progress_bar = st.progress(0)
+                            status_text = st.empty()
                             
-                            # Update status text
-                            status_text.text(f"🔄 Membersihkan teks... ({current_batch}/{total_batches} batch)")
-                        
-                        progress_bar.progress(1.0)
-                        status_text.text("✅ Cleaning selesai!")
-                        
-                        # Progress bar untuk prediction
-                        status_text.text("Melakukan prediksi...")
-                        progress_bar.progress(0)
-                        
-                        # Prediction dengan batch processing
-                        results = predict_batch(cleaned_comments, batch_size=16)
-                        
-                        progress_bar.progress(1.0)
-                        status_text.text("✅ Prediksi selesai!")
-                        
-                        # Logging untuk debugging
-                        for i, (original, cleaned, pred_result) in enumerate(zip(comment_texts, cleaned_comments, results)):
-                            logger.info(f"Comment {i+1}: '{original[:30]}...' -> '{cleaned[:30]}...' -> {pred_result['prediction']} ({pred_result['confidence']:.2%})")
-                        
-                        # Filter by threshold
-                        filtered_results = []
-                        for i, result_pred in enumerate(results):
-                            if result_pred['confidence'] >= threshold:
-                                filtered_results.append({
-                                    'comment': comment_texts[i],
-                                    'label': result_pred['label'],
-                                    'prediction': result_pred['prediction'],
-                                    'confidence': result_pred['confidence']
-                                })
-                        
-                        # Statistics
-                        judi_count = sum(1 for r in results if r['prediction'] == 1)
-                        normal_count = sum(1 for r in results if r['prediction'] == 0)
-                        filtered_count = len(filtered_results)
-                        
-                        st.subheader("📊 Statistik Analisis")
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            styled_metric("Total Komentar", len(results), color='primary')
-                        with col2:
-                            styled_metric("Komentar Judi", judi_count, color='danger')
-                        with col3:
-                            styled_metric("Komentar Normal", normal_count, color='success')
-                        with col4:
-                            styled_metric("Filtered (≥threshold)", filtered_count, color='info')
-                        
-                        # Chart visualisasi
-                        chart_df = pd.DataFrame({
-                            'Kategori': ['Judi', 'Normal'],
-                            'Jumlah': [judi_count, normal_count]
-                        })
-                        st.markdown("### Visualisasi Hasil")
-                        col_chart1, col_chart2 = st.columns(2)
-                        with col_chart1:
-                            fig_pie = px.pie(chart_df, names='Kategori', values='Jumlah', title='Distribusi Komentar')
-                            st.plotly_chart(fig_pie, use_container_width=True)
-                        with col_chart2:
-                            fig_bar = px.bar(chart_df, x='Kategori', y='Jumlah', color='Kategori', title='Jumlah Komentar per Kategori', text='Jumlah')
-                            st.plotly_chart(fig_bar, use_container_width=True)
-                        
-                        # Results table
-                        if filtered_results:
-                            st.subheader("📋 Hasil Analisis")
-                            results_df = pd.DataFrame(filtered_results)
-                            st.dataframe(results_df)
+                            # Scraping, cleaning dan prediction berjalan overlap per chunk
+                            status_text.text("🔄 Mengambil, membersihkan dan memprediksi komentar...")
+                            comment_texts, cleaned_comments, results = clean_and_predict(
+                                text_chunks, max_comments, progress_bar, status_text
+                            )
+                            st.toast("✅ Berhasil mengambil komentar dari YouTube!")
+                            
+                            progress_bar.progress(1.0)
+                            status_text.text("✅ Prediksi selesai!")
                             
-                            # Debug info
-                            with st.expander("Debug Info (Semua Komentar)"):
-                                debug_df = pd.DataFrame({
-                                    'Original Text': comment_texts,
-                                    'Cleaned Text': cleaned_comments,
-                                    'Label': [r['label'] for r in results],
-                                    'Confidence': [f"{r['confidence']:.2%}" for r in results],
-                                    'Prediction': [r['prediction'] for r in results]
-                                })
-                                st.dataframe(debug_df)
+                            # Logging untuk debugging, hanya jika level DEBUG aktif
+                            if logger.isEnabledFor(logging.DEBUG):
+                                for i, (original, cleaned, pred_result) in enumerate(zip(comment_texts, cleaned_comments, results)):
+                                    logger.debug("Comment %d: '%.30s...' -> '%.30s...' -> %s (%.2f)", i+1, original, cleaned, pred_result['prediction'], pred_result['confidence'])
                             
-                            # Download results
-                            csv = results_df.to_csv(index=False)
-                            st.download_button(
-                                label="📥 Download Hasil CSV",
-                                data=csv,
-                                file_name="hasil_analisis_youtube.csv",
-                                mime="text/csv"
+                            # Semua hasil dalam satu DataFrame, confidence masih numerik untuk filter threshold
+                            all_df, judi_count, normal_count = build_results_df(
+                                comment_texts, cleaned_comments, results,
+                                text_columns=('Original Text', 'Cleaned Text'),
+                                format_confidence=False
                             )
+                            
+                            # Simpan hasil agar perubahan threshold tidak memicu scraping, prediksi
+                            # maupun penyusunan DataFrame ulang
+                            st.session_state['yt_cache'] = {
+                                'url': youtube_url,
+                                'max': max_comments,
+                                'video_info': result['video_info'],
+                                'all_df': all_df,
+                                'judi_count': judi_count,
+                                'normal_count': normal_count
+                            }
+                            
+                            logger.info(f"Analisis YouTube selesai - Judi: {judi_count}, Normal: {normal_count}")
+                            
                         else:
-                            st.warning("⚠️ Tidak ada komentar yang memenuhi threshold!")
+                            st.error(f"❌ Error: {result['error']}")
+                            logger.error(f"Error scraping YouTube: {result['error']}")
                             
-                            # Debug info jika tidak ada hasil
-                            with st.expander("Debug Info (Semua Komentar)"):
-                                debug_df = pd.DataFrame({
-                                    'Original Text': comment_texts,
-                                    'Cleaned Text': cleaned_comments,
-                                    'Label': [r['label'] for r in results],
-                                    'Confidence': [f"{r['confidence']:.2%}" for r in results],
-                                    'Prediction': [r['prediction'] for r in results]
-                                })
-                                st.dataframe(debug_df)
-                        
-                        logger.info(f"Analisis YouTube selesai - Judi: {judi_count}, Normal: {normal_count}, Filtered: {filtered_count}")
-                        
-                    else:
-                        st.error(f"❌ Error: {result['error']}")
-                        logger.error(f"Error scraping YouTube: {result['error']}")
-                        
-                except Exception as e:
-                    st.error(f"❌ Error saat analisis: {e}")
-                    logger.error(f"Error saat analisis YouTube: {e}")
+                    except Exception as e:
+                        st.error(f"❌ Error saat analisis: {e}")
+                        logger.error(f"Error saat analisis YouTube: {e}")
         else:
             st.warning("⚠️ Masukkan URL YouTube terlebih dahulu!")
+    
+    # Hasil ditampilkan di luar blok tombol agar perubahan threshold langsung terlihat
+    yt_cache = st.session_state.get('yt_cache')
+    if yt_cache and yt_cache['url'] == youtube_url and yt_cache['max'] == max_comments:
+        try:
+            youtube_results_section(yt_cache, threshold)
+        except Exception as e:
+            st.error(f"❌ Error saat menampilkan hasil: {e}")
+            logger.error(f"Error saat menampilkan hasil YouTube: {e}")
+
+def youtube_results_section(yt_cache: Dict, threshold: float):
+    """Menampilkan hasil analisis YouTube yang tersimpan di session state"""
+    all_df = yt_cache['all_df']
+    judi_count = yt_cache['judi_count']
+    normal_count = yt_cache['normal_count']
+    
+    # Video info
+    video_info = yt_cache['video_info']
+    st.subheader("📺 Informasi Video")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Judul:** {video_info['title']}")
+        st.write(f"**Channel:** {video_info['channel']}")
+    with col2:
+        st.write(f"**Views:** {video_info['view_count']}")
+        st.write(f"**Komentar:** {video_info['comment_count']}")
+    
+    # Filter by threshold dengan boolean mask
+    mask = all_df['Confidence'] >= threshold
+    results_df = all_df.loc[mask, ['Original Text', 'Label', 'Prediction', 'Confidence']].rename(
+        columns={'Original Text': 'comment', 'Label': 'label', 'Prediction': 'prediction', 'Confidence': 'confidence'}
+    )
+    debug_df = all_df.assign(Confidence=format_confidence_column(all_df['Confidence']))
+    
+    # Statistics
+    filtered_count = int(mask.sum())
+    
+    st.subheader("📊 Statistik Analisis")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        styled_metric("Total Komentar", len(all_df), color='primary')
+    with col2:
+        styled_metric("Komentar Judi", judi_count, color='danger')
+    with col3:
+        styled_metric("Komentar Normal", normal_count, color='success')
+    with col4:
+        styled_metric("Filtered (≥threshold)", filtered_count, color='info')
+    
+    # Chart visualisasi langsung dari nilai mentah, tanpa DataFrame perantara
+    kategori = ['Judi', 'Normal']
+    jumlah = [judi_count, normal_count]
+    st.markdown("### Visualisasi Hasil")
+    import plotly.express as px  # Lazy import, hanya halaman dengan chart yang membutuhkan
+    col_chart1, col_chart2 = st.columns(2)
+    with col_chart1:
+        fig_pie = px.pie(names=kategori, values=jumlah, title='Distribusi Komentar')
+        st.plotly_chart(fig_pie, use_container_width=True)
+    with col_chart2:
+        fig_bar = px.bar(x=kategori, y=jumlah, color=kategori, text=jumlah, title='Jumlah Komentar per Kategori',
+                         labels={'x': 'Kategori', 'y': 'Jumlah', 'color': 'Kategori'})
+        st.plotly_chart(fig_bar, use_container_width=True)
+    
+    # Results table
+    if filtered_count:
+        st.subheader("📋 Hasil Analisis")
+        show_limited_dataframe(results_df, DISPLAY_MAX_ROWS)
+        
+        # Debug info
+        with st.expander("Debug Info (Semua Komentar)"):
+            show_limited_dataframe(debug_df, DEBUG_MAX_ROWS, downloadable=False)
+        
+        # Download results
+        csv = to_csv_bytes(results_df)
+        st.download_button(
+            label="📥 Download Hasil CSV",
+            data=csv,
+            file_name="hasil_analisis_youtube.csv",
+            mime="text/csv"
+        )
+    else:
+        st.warning("⚠️ Tidak ada komentar yang memenuhi threshold!")
+        
+        # Debug info jika tidak ada hasil
+        with st.expander("Debug Info (Semua Komentar)"):
+            show_limited_dataframe(debug_df, DEBUG_MAX_ROWS, downloadable=False)
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,52 @@
+import logging
 import re
+import sys
 import emoji
 import unicodedata
 from datasets import load_dataset
-from typing import Dict, List
-from functools import lru_cache
+from typing import Callable, Dict, List
+from types import MappingProxyType
+from functools import lru_cache, partial
 import time
 
+logger = logging.getLogger(__name__)
+
 # Global variable untuk caching dictionary
 _slang_dict = None
+_slang_replace = None
 _dict_loaded = False
 
+# Jumlah maksimal hasil preprocess_teks yang disimpan di cache
+PREPROCESS_CACHE_SIZE = 100_000
+
+# Replacer untuk kamus kustom di replace_slang: id(kamus) -> (kamus, jumlah kata, replacer).
+# Referensi ke kamus disimpan agar id-nya tidak dipakai ulang objek lain
+_CUSTOM_REPLACER_CACHE_SIZE = 8
+_custom_replacers = {}
+
+# Nama emoji, URL, mention/hashtag, angka berdiri sendiri dan simbol
+# dibuang sekaligus dalam satu kali scan. Urutan lama membuang nama emoji dulu,
+# lalu URL, jadi URL berhenti sebelum nama emoji; lookahead "http" menjaga hasil
+# tetap sama untuk token yang menempel URL.
+_EMOJI_NAME = r':[a-zA-Z_]+:'
+_AWAL_URL = r'http(?!' + _EMOJI_NAME + r')\S'
+_POLA_DIBUANG = re.compile(
+    r'http(?:(?!' + _EMOJI_NAME + r')\S)+'      # URL
+    r'|[@#](?:(?!' + _AWAL_URL + r')\w)+'       # Mention dan hashtag
+    r'|' + _EMOJI_NAME +                         # Nama emoji
+    r'|\b\d+(?:\b|(?=' + _AWAL_URL + r'))'      # Angka berdiri sendiri
+    r'|[^\w\s]'                                 # Simbol
+)
+
+# Transformasi lanjutan setelah pembuangan, dikompilasi sekali saat import
+_TRANSFORMASI = [
+    (re.compile(r'\s+'), ' '),               # Hapus spasi berlebih
+    (re.compile(r'(\w)\1{2,}'), r'\1'),      # Normalisasi karakter berulang (aaa -> a)
+]
+
+# Pola huruf terpisah (contoh: p r o m o)
+_POLA_HURUF_TERPISAH = re.compile(r'\b(?:[a-zA-Z]\s){2,}[a-zA-Z]\b')
+
 def normalisasi_unicode(text: str) -> str:
     """
     Menormalisasi karakter unicode menjadi ASCII.
@@ -22,8 +59,21 @@ def normalisasi_unicode(text: str) -> str:
     """
     if not isinstance(text, str):
         text = str(text)
+    # Teks ASCII tidak berubah oleh normalisasi, lewati alokasi string baru
+    if text.isascii():
+        return text
     return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
 
+def _demojize(text: str) -> str:
+    """
+    Mengubah emoji menjadi nama emoji (:nama_emoji:).
+    Emoji selalu berupa karakter non-ASCII, jadi teks ASCII langsung dikembalikan
+    tanpa melewati tabel emoji.
+    """
+    if text.isascii():
+        return text
+    return emoji.demojize(text)
+
 def clean_text(text: str) -> str:
     """
     Membersihkan teks dari karakter yang tidak diinginkan
@@ -39,22 +89,12 @@ def clean_text(text: str) -> str:
     
     # Konversi ke huruf kecil dan handle emoji
     text = text.lower()
-    text = emoji.demojize(text)
+    text = _demojize(text)
     
-    # Transformasi untuk membersihkan teks
-    transformasi = [
-        (r':[a-zA-Z_]+:', ' '),      # Hapus nama emoji
-        (r'http\S+', ''),             # Hapus URL
-        (r'@\w+|#\w+', ''),          # Hapus mention dan hashtag
-        (r'[^\w\s]', ' '),           # Hapus simbol, pertahankan alfanumerik
-        (r'\b\d+\b', ' '),           # Hapus angka berdiri sendiri
-        (r'\s+', ' '),               # Hapus spasi berlebih
-        (r'(\w)\1{2,}', r'\1'),      # Normalisasi karakter berulang (aaa -> a)
-    ]
-    
-    # Terapkan transformasi
-    for pola, pengganti in transformasi:
-        text = re.sub(pola, pengganti, text)
+    # Buang elemen yang tidak diinginkan, lalu terapkan transformasi
+    text = _POLA_DIBUANG.sub(' ', text)
+    for pola, pengganti in _TRANSFORMASI:
+        text = pola.sub(pengganti, text)
     
     return text.strip()
 
@@ -71,8 +111,7 @@ def combine_character(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
-    pola = r'\b(?:[a-zA-Z]\s){2,}[a-zA-Z]\b'
-    matches = re.findall(pola, text)
+    matches = _POLA_HURUF_TERPISAH.findall(text)
     
     for match in matches:
         gabungan = match.replace(' ', '')
@@ -85,7 +124,7 @@ def init_dictionary():
     Inisialisasi dictionary slang saat aplikasi pertama kali dijalankan.
     Dictionary hanya dimuat sekali dan disimpan dalam cache.
     """
-    global _slang_dict, _dict_loaded
+    global _slang_dict, _slang_replace, _dict_loaded
     
     if _dict_loaded:
         print("Dictionary sudah dimuat sebelumnya")
@@ -95,10 +134,14 @@ def init_dictionary():
     start_time = time.time()
     
     try:
-        _slang_dict = load_slang_dict()
+        # Kamus dibekukan agar tidak bisa diubah tanpa sengaja dari luar modul
+        _slang_dict = MappingProxyType(load_slang_dict())
+        _slang_replace = _make_slang_replacer(_slang_dict)
         load_time = time.time() - start_time
         print(f"Dictionary berhasil dimuat dalam {load_time:.2f} detik")
         _dict_loaded = True
+        # Hasil yang dibuat sebelum dictionary tersedia tidak boleh dipakai lagi
+        _preprocess_teks_cached.cache_clear()
         return True
         
     except Exception as e:
@@ -175,7 +218,7 @@ def load_slang_dict() -> Dict[str, str]:
     }
     
     try:
-        # load dataset dari hugging face
+        # load dataset dari hugging face; setelah unduhan pertama dibaca dari cache disk lokal
         dataset = load_dataset("zeroix07/indo-slang-words", split="train")
         
         # Ekstrak pasangan slang-formal
@@ -194,7 +237,9 @@ def load_slang_dict() -> Dict[str, str]:
                 if len(parts) == 2:
                     slang, formal = parts[0].strip(), parts[1].strip()
                     if slang and formal:  # Ensure not empty
-                        kamus_hf[slang] = formal
+                        # Teks sudah huruf kecil saat dicocokkan, jadi kunci juga disimpan
+                        # huruf kecil (dan di-intern) sekali di sini
+                        kamus_hf[sys.intern(slang.lower())] = formal
         
         # Gabungkan dengan kamus manual
         kamus_gabungan = {**kamus_hf, **kamus_manual}
@@ -203,9 +248,90 @@ def load_slang_dict() -> Dict[str, str]:
         return kamus_gabungan
     
     except Exception as e:
-        print(f"Error saat memuat kamus slang dari Hugging Face: {e}")
+        # Tanpa kamus HF, penggantian slang (dan hasil prediksi) berbeda dari biasanya
+        logger.warning(
+            f"Gagal memuat kamus slang dari Hugging Face, hanya memakai {len(kamus_manual)} "
+            f"kata slang manual: {e}"
+        )
         return kamus_manual
 
+def _trie_regex(node: Dict) -> str:
+    """
+    Mengubah satu node trie menjadi potongan regex.
+    Cabang dengan awalan sama digabung sehingga regex engine tidak perlu
+    mencoba ribuan alternatif satu per satu di setiap posisi.
+    """
+    akhir_kata = '' in node
+    cabang = [re.escape(huruf) + _trie_regex(anak) for huruf, anak in sorted(node.items()) if huruf]
+    if not cabang:
+        return ''
+    if len(cabang) == 1 and not akhir_kata:
+        return cabang[0]
+    pola = '(?:' + '|'.join(cabang) + ')'
+    return pola + '?' if akhir_kata else pola
+
+def build_slang_pattern(kamus_slang: Dict[str, str]):
+    """
+    Menyusun satu regex untuk semua kata slang dalam kamus.
+    Kata-kata disusun sebagai trie agar pencarian tetap linear terhadap panjang teks.
+    Hanya kunci berupa satu kata (alfanumerik) yang dimasukkan, sama seperti
+    pencocokan per kata sebelumnya.
+    
+    Args:
+        kamus_slang (Dict[str, str]): Kamus slang
+        
+    Returns:
+        re.Pattern: Regex kata slang, atau None jika kamus kosong
+    """
+    trie = {}
+    for slang in kamus_slang:
+        if not re.fullmatch(r'\w+', slang):
+            continue
+        node = trie
+        for huruf in slang:
+            node = node.setdefault(huruf, {})
+        node[''] = True
+    
+    if not trie:
+        return None
+    return re.compile(r'\b' + _trie_regex(trie) + r'\b')
+
+def _make_slang_replacer(kamus_slang: Dict[str, str]) -> Callable[[str], str]:
+    """
+    Mengikat regex slang dan kamus ke satu fungsi pengganti, sehingga
+    replace_slang tidak perlu membuat callback baru di setiap pemanggilan.
+    
+    Args:
+        kamus_slang (Dict[str, str]): Kamus slang
+        
+    Returns:
+        Callable[[str], str]: Fungsi yang mengganti semua kata slang dalam teks
+    """
+    pola = build_slang_pattern(kamus_slang)
+    if pola is None:
+        return str
+    
+    def ganti(match, kamus=kamus_slang):
+        return kamus[match[0]]
+    
+    return partial(pola.sub, ganti)
+
+def _get_custom_replacer(kamus_slang: Dict[str, str]) -> Callable[[str], str]:
+    """
+    Replacer untuk kamus kustom, dibuat sekali per objek kamus. Membangun trie regex
+    butuh waktu sebanding ukuran kamus, jadi tidak diulang di setiap pemanggilan.
+    Replacer dibuat ulang jika jumlah kata di kamus berubah.
+    """
+    entry = _custom_replacers.get(id(kamus_slang))
+    if entry is not None and entry[0] is kamus_slang and entry[1] == len(kamus_slang):
+        return entry[2]
+    
+    replacer = _make_slang_replacer(kamus_slang)
+    if len(_custom_replacers) >= _CUSTOM_REPLACER_CACHE_SIZE:
+        _custom_replacers.clear()
+    _custom_replacers[id(kamus_slang)] = (kamus_slang, len(kamus_slang), replacer)
+    return replacer
+
 def replace_slang(text: str, kamus_slang: Dict[str, str] = None) -> str:
     """
     Mengganti kata slang
@@ -213,6 +339,8 @@ def replace_slang(text: str, kamus_slang: Dict[str, str] = None) -> str:
     Args:
         text (str): Teks input yang berisi kata slang
         kamus_slang (Dict[str, str]): Kamus slang. Jika None, akan memuat kamus default.
+            Regex untuk kamus kustom di-cache per objek kamus; jika isi kamus diubah
+            tanpa mengubah jumlah katanya, gunakan objek dict baru.
         
     Returns:
         str: Teks dengan kata slang yang sudah diganti
@@ -225,33 +353,17 @@ def replace_slang(text: str, kamus_slang: Dict[str, str] = None) -> str:
         if not init_dictionary():
             return text
     
+    # Satu kali scan regex untuk seluruh teks
     if kamus_slang is None:
-        kamus_slang = _slang_dict
-    
-    # Pisahkan teks menjadi kata-kata dan ganti setiap kata
-    words = text.split()
-    replaced_words = []
-    
-    for word in words:
-        # Cek kecocokan
-        if word in kamus_slang:
-            replaced_words.append(kamus_slang[word])
-        else:
-            # Cek kata dengan tanda baca
-            cleaned_word = re.sub(r'[^\w]', '', word)
-            if cleaned_word in kamus_slang:
-                # Pertahankan tanda baca asli
-                tanda_baca = word[len(cleaned_word):]
-                replaced_words.append(kamus_slang[cleaned_word] + tanda_baca)
-            else:
-                replaced_words.append(word)
-    
-    return " ".join(replaced_words)
+        return _slang_replace(text)
+    return _get_custom_replacer(kamus_slang)(text)
 
-def preprocess_teks_batch(texts: List[str]) -> List[str]:
+def preprocess_teks_batch(texts: List[str], raise_errors: bool = False) -> List[str]:
     """
     Pipeline lengkap untuk preprocessing batch teks.
-    Optimasi: gunakan list comprehension dan pandas jika tersedia.
+    Optimasi: list comprehension lewat preprocess_teks sehingga cache per teks terpakai.
+    Jika raise_errors True, kegagalan memuat dictionary dilempar sebagai exception
+    alih-alih mengembalikan teks mentah.
     """
     if not texts:
         return []
@@ -259,6 +371,8 @@ def preprocess_teks_batch(texts: List[str]) -> List[str]:
     # Pastikan dictionary sudah dimuat
     if not _dict_loaded:
         if not init_dictionary():
+            if raise_errors:
+                raise RuntimeError("Dictionary slang gagal dimuat")
             return [str(text) if text else "" for text in texts]
     
     # Optimasi dengan list comprehension
@@ -276,7 +390,14 @@ def preprocess_teks(text: str) -> str:
     """
     if not isinstance(text, str):
         text = str(text)
-    
+    return _preprocess_teks_cached(text)
+
+@lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def _preprocess_teks_cached(text: str) -> str:
+    """
+    Isi pipeline preprocess_teks. Hasil disimpan per teks karena komentar spam
+    sering diposting ulang dengan isi yang sama persis.
+    """
     # Normalisasi karakter unicode
     text = normalisasi_unicode(text)
     
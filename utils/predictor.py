@@ -1,25 +1,102 @@
 import tensorflow as tf
 from transformers import TFAutoModelForSequenceClassification, AutoTokenizer, pipeline
 from typing import List, Dict, Union
+from collections import OrderedDict
+import threading
 import time
 import numpy as np
 import os
 os.environ["OMP_NUM_THREADS"] = "1"
 os.environ["TF_NUM_INTRAOP_THREADS"] = "1"
 os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+# Tokenizer Rust boleh memakai banyak thread untuk batch (tidak terpengaruh OMP_NUM_THREADS)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Model ONNX int8 (hasil export_onnx_model), dipakai jika file tersedia
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", os.path.join("models", "indobert-komentarbersih.int8.onnx"))
+
+# Presisi model TF: "auto" (mixed float16 jika ada GPU), "bfloat16" (CPU dengan AVX-512 BF16/AMX) atau "float32"
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "auto").lower()
+
+# Kompilasi XLA (jit_compile) untuk forward pass TF. Nonaktif secara default karena
+# setiap shape baru memicu kompilasi BERT beberapa detik dan manfaatnya di CPU belum diukur
+MODEL_XLA = os.getenv("MODEL_XLA", "0").lower() in ("1", "true", "yes")
 
 # Global variable untuk caching model
 _model = None
 _tokenizer = None
 _classifier = None
+_session = None
+_forward = None
 _model_loaded = False
+_precision = "float32"
+
+# Cache hasil tokenisasi per teks (LRU), dipakai ulang saat komentar yang sama diprediksi lagi
+ENCODING_CACHE_SIZE = 20_000
+_encoding_cache = OrderedDict()
+_encoding_lock = threading.Lock()
+
+# XLA mengompilasi ulang untuk setiap shape input baru. Panjang sequence dibulatkan ke
+# kelipatan PAD_TO_MULTIPLE_OF dan ukuran batch ke pangkat dua, sehingga jumlah shape
+# (dan kompilasi) tetap kecil walaupun ukuran chunk di app selalu berubah
+PAD_TO_MULTIPLE_OF = 16
+
+def _configure_precision() -> str:
+    """
+    Memilih presisi komputasi sebelum model dibuat sesuai MODEL_PRECISION.
+    Mixed precision menyimpan variabel dalam float32 tetapi menjalankan komputasi
+    dalam float16/bfloat16 untuk menghemat memori dan mempercepat matmul attention.
+    Secara default float16 hanya dipakai di GPU; bfloat16 harus diaktifkan eksplisit
+    karena hanya lebih cepat di CPU yang mendukung AVX-512 BF16/AMX.
+    
+    Returns:
+        str: Nama policy presisi yang dipakai
+    """
+    if MODEL_PRECISION == "bfloat16":
+        tf.keras.mixed_precision.set_global_policy('mixed_bfloat16')
+        return "mixed_bfloat16"
+    if MODEL_PRECISION == "auto" and tf.config.list_physical_devices('GPU'):
+        tf.keras.mixed_precision.set_global_policy('mixed_float16')
+        return "mixed_float16"
+    return "float32"
+
+def _build_forward():
+    """
+    Membungkus forward pass model dalam tf.function dengan XLA (jit_compile) agar
+    operasi attention, GELU dan matmul difusikan. Signature [None, None] mencegah
+    retracing, tetapi XLA tetap mengompilasi per shape; karena itu _predict_logits
+    hanya memanggilnya dengan shape yang sudah dibulatkan (lihat _batch_bucket).
+    
+    Returns:
+        Callable: Fungsi yang menerima dict input tokenizer dan mengembalikan logits
+    """
+    input_signature = [{
+        name: tf.TensorSpec([None, None], tf.int32, name=name)
+        for name in _tokenizer.model_input_names
+    }]
+    
+    @tf.function(jit_compile=True, input_signature=input_signature)
+    def forward(inputs):
+        return _model(inputs, training=False).logits
+    
+    # Pemanasan sekali dengan shape yang sama seperti prediksi satu teks (batch 1,
+    # panjang PAD_TO_MULTIPLE_OF); jika XLA tidak didukung, pemanggil kembali ke mode eager
+    warmup = _encode(["warmup"], "tf", PAD_TO_MULTIPLE_OF)
+    forward({name: warmup[name] for name in _tokenizer.model_input_names})
+    return forward
 
 def load_model():
     """
     Memuat model IndoBERT untuk klasifikasi komentar judi.
     Model hanya dimuat sekali dan disimpan dalam cache.
     """
-    global _model, _tokenizer, _classifier, _model_loaded
+    global _model, _tokenizer, _classifier, _model_loaded, _precision, _session, _forward
     
     if _model_loaded:
         print("Model sudah dimuat sebelumnya")
@@ -27,9 +104,21 @@ def load_model():
     
     try:
         # Load tokenizer
-        _tokenizer = AutoTokenizer.from_pretrained("fhru/indobert-komentarbersih")
-        # Load model
-        _model = TFAutoModelForSequenceClassification.from_pretrained("fhru/indobert-komentarbersih")
+        _tokenizer = AutoTokenizer.from_pretrained("fhru/indobert-komentarbersih", use_fast=True)
+        if ONNX_AVAILABLE and os.path.exists(ONNX_MODEL_PATH):
+            # Model ONNX int8 lebih cepat di CPU dibanding TF eager
+            _session = ort.InferenceSession(ONNX_MODEL_PATH, providers=['CPUExecutionProvider'])
+            _precision = "int8 (onnx)"
+        else:
+            # Pilih presisi sebelum model dibuat, lalu load model
+            _precision = _configure_precision()
+            _model = TFAutoModelForSequenceClassification.from_pretrained("fhru/indobert-komentarbersih")
+            _forward = None
+            if MODEL_XLA:
+                try:
+                    _forward = _build_forward()
+                except Exception as e:
+                    print(f"XLA tidak tersedia, memakai mode eager: {e}")
         _model_loaded = True
         print("Model dan tokenizer berhasil dimuat!")
         return True
@@ -37,9 +126,80 @@ def load_model():
         print(f"Error saat memuat model: {e}")
         return False
 
-def predict_text(text: str) -> Dict[str, Union[str, float, int]]:
+def _encode(texts: List[str], return_tensors: str, pad_to_multiple_of: int = None):
+    """
+    Tokenisasi batch dengan cache per teks. Hanya teks yang belum ada di cache
+    yang ditokenisasi (sekaligus dalam satu panggilan), lalu semua hasil dipadding
+    bersama ke panjang terpanjang di batch.
+    """
+    with _encoding_lock:
+        misses = [t for t in dict.fromkeys(texts) if t not in _encoding_cache]
+        if misses:
+            encoded = _tokenizer(misses, truncation=True, max_length=128)
+            keys = list(encoded.keys())
+            for j, text in enumerate(misses):
+                _encoding_cache[text] = {key: encoded[key][j] for key in keys}
+        
+        features = []
+        for text in texts:
+            _encoding_cache.move_to_end(text)
+            features.append(_encoding_cache[text])
+        
+        while len(_encoding_cache) > ENCODING_CACHE_SIZE:
+            _encoding_cache.popitem(last=False)
+    
+    return _tokenizer.pad(features, padding="longest", pad_to_multiple_of=pad_to_multiple_of,
+                          return_tensors=return_tensors)
+
+def _batch_bucket(n: int) -> int:
+    """Ukuran batch dibulatkan ke pangkat dua terdekat ke atas (1, 2, 4, 8, ...)."""
+    return 1 << (n - 1).bit_length()
+
+def _predict_logits(texts: List[str]):
+    """
+    Tokenisasi dan inferensi satu batch teks, menggunakan ONNX Runtime jika
+    session tersedia dan TensorFlow jika tidak. Hasil TF tetap berupa tensor di
+    device agar pemanggil bisa menyalinnya ke host sekali saja.
+    
+    Returns:
+        np.ndarray | tf.Tensor: Logits float32 dengan shape (len(texts), 2)
+    """
+    if _session is not None:
+        inputs = _encode(texts, "np")
+        feed = {
+            inp.name: inputs[inp.name].astype(np.int32 if inp.type == 'tensor(int32)' else np.int64)
+            for inp in _session.get_inputs()
+        }
+        return _session.run(None, feed)[0].astype(np.float32)
+    
+    if _forward is not None:
+        # Isi batch dengan salinan teks pertama sampai ukuran bucket, lalu buang logits-nya
+        n = len(texts)
+        padded = texts + [texts[0]] * (_batch_bucket(n) - n)
+        inputs = _encode(padded, "tf", PAD_TO_MULTIPLE_OF)
+        logits = _forward({name: inputs[name] for name in _tokenizer.model_input_names})[:n]
+    else:
+        logits = _model(_encode(texts, "tf")).logits
+    return tf.cast(logits, tf.float32)
+
+def _predict_probs(texts: List[str]):
+    """
+    Probabilitas tiap kelas untuk satu batch teks (softmax stabil dari _predict_logits).
+    
+    Returns:
+        np.ndarray | tf.Tensor: Probabilitas tiap kelas dengan shape (len(texts), 2)
+    """
+    logits = _predict_logits(texts)
+    if _session is not None:
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+    return tf.nn.softmax(logits, axis=-1)
+
+def predict_text(text: str, return_confidence: bool = True) -> Dict[str, Union[str, float, int]]:
     """
     Melakukan prediksi untuk satu teks secara manual (tanpa pipeline).
+    Label diambil langsung dari argmax logits; softmax hanya dihitung jika
+    confidence dibutuhkan (jika tidak, confidence bernilai None).
     """
     if not _model_loaded:
         if not load_model():
@@ -47,51 +207,65 @@ def predict_text(text: str) -> Dict[str, Union[str, float, int]]:
     if not text or not text.strip():
         return {"label": "Komentar Normal", "confidence": 0.0, "prediction": 0}
     try:
-        # Tokenisasi dan padding
-        inputs = _tokenizer(text, return_tensors="tf", truncation=True, padding=True, max_length=128)
-        outputs = _model(inputs)
-        logits = outputs.logits.numpy()[0]
-        probs = np.exp(logits) / np.sum(np.exp(logits))
-        pred_id = int(np.argmax(probs))
-        confidence = float(np.max(probs))
+        logits = np.asarray(_predict_logits([text]))[0]
+        pred_id = int(logits.argmax())
+        confidence = None
+        if return_confidence:
+            # Probabilitas kelas terpilih = 1 / sum(exp(logit - logit_max)), stabil secara numerik
+            confidence = float(1.0 / np.exp(logits - logits[pred_id]).sum())
         label = "Komentar Judi" if pred_id == 1 else "Komentar Normal"
         return {"label": label, "confidence": confidence, "prediction": pred_id}
     except Exception as e:
         print(f"Error saat prediksi: {e}")
         return {"label": "Komentar Normal", "confidence": 0.0, "prediction": 0}
 
-def predict_batch(texts: List[str], batch_size: int = 16) -> List[Dict[str, Union[str, float, int]]]:
+def predict_batch(texts: List[str], batch_size: int = 32,
+                  raise_errors: bool = False) -> List[Dict[str, Union[str, float, int]]]:
     """
     Melakukan prediksi batch manual (tanpa pipeline) dengan batch kecil untuk menghemat memori.
+    Teks diurutkan berdasarkan panjang sebelum dibagi ke batch untuk mengurangi padding.
+    Jika raise_errors True, kegagalan memuat model atau prediksi dilempar sebagai exception
+    alih-alih dikembalikan sebagai hasil fallback (misalnya agar hasil fallback tidak di-cache).
     """
     if not _model_loaded:
         if not load_model():
+            if raise_errors:
+                raise RuntimeError("Model gagal dimuat")
             return [{"label": "Error", "confidence": 0.0, "prediction": -1}] * len(texts)
     if not texts:
         return []
-    results = []
+    results = [None] * len(texts)
     try:
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i+batch_size]
-            # Tokenisasi batch
-            inputs = _tokenizer(batch, return_tensors="tf", truncation=True, padding=True, max_length=128)
-            outputs = _model(inputs)
-            logits = outputs.logits.numpy()
-            probs = np.exp(logits) / np.sum(np.exp(logits), axis=1, keepdims=True)
-            pred_ids = np.argmax(probs, axis=1)
-            confidences = np.max(probs, axis=1)
-            for j, text in enumerate(batch):
-                if not text or not text.strip():
-                    results.append({"label": "Komentar Normal", "confidence": 0.0, "prediction": 0})
-                else:
-                    label = "Komentar Judi" if pred_ids[j] == 1 else "Komentar Normal"
-                    results.append({
-                        "label": label,
-                        "confidence": float(confidences[j]),
-                        "prediction": int(pred_ids[j])
-                    })
+        # Kelompokkan teks dengan panjang mirip agar padding tiap batch minimal,
+        # lalu kembalikan hasil ke urutan semula
+        order = sorted(range(len(texts)), key=lambda k: len(texts[k]))
+        batch_probs = [
+            _predict_probs([texts[k] for k in order[i:i+batch_size]])
+            for i in range(0, len(order), batch_size)
+        ]
+        
+        # Satu kali salin ke host untuk seluruh batch, argmax/max sekaligus
+        if _session is None:
+            probs = tf.concat(batch_probs, axis=0).numpy()
+        else:
+            probs = np.concatenate(batch_probs)
+        pred_ids = probs.argmax(axis=1).tolist()
+        confidences = probs.max(axis=1).tolist()
+        
+        for j, k in enumerate(order):
+            text = texts[k]
+            if not text or not text.strip():
+                results[k] = {"label": "Komentar Normal", "confidence": 0.0, "prediction": 0}
+            else:
+                results[k] = {
+                    "label": "Komentar Judi" if pred_ids[j] == 1 else "Komentar Normal",
+                    "confidence": confidences[j],
+                    "prediction": pred_ids[j]
+                }
         return results
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Error saat prediksi batch: {e}")
         return [{"label": "Komentar Normal", "confidence": 0.0, "prediction": 0}] * len(texts)
 
@@ -105,9 +279,43 @@ def get_model_info() -> Dict[str, str]:
     return {
         "model_name": "fhru/indobert-komentarbersih",
         "labels": {0: "Komentar Normal", 1: "Komentar Judi"},
-        "device": "GPU" if tf.config.list_physical_devices('GPU') else "CPU",
+        "device": "CPU" if _session is not None else ("GPU" if tf.config.list_physical_devices('GPU') else "CPU"),
+        "precision": _precision,
         "model_loaded": _model_loaded
     }
+
+def export_onnx_model(output_path: str = ONNX_MODEL_PATH) -> bool:
+    """
+    Mengekspor model ke ONNX lalu melakukan kuantisasi dinamis int8.
+    Cukup dijalankan sekali; load_model akan memakai hasilnya secara otomatis.
+    Membutuhkan paket tf2onnx dan onnxruntime.
+    
+    Args:
+        output_path (str): Lokasi file model ONNX int8
+        
+    Returns:
+        bool: True jika ekspor berhasil
+    """
+    try:
+        import tf2onnx
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        model = TFAutoModelForSequenceClassification.from_pretrained("fhru/indobert-komentarbersih")
+        input_signature = [
+            tf.TensorSpec((None, None), tf.int32, name="input_ids"),
+            tf.TensorSpec((None, None), tf.int32, name="attention_mask"),
+            tf.TensorSpec((None, None), tf.int32, name="token_type_ids"),
+        ]
+        
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        fp32_path = os.path.splitext(output_path)[0] + ".fp32.onnx"
+        tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=13, output_path=fp32_path)
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+        print(f"Model ONNX int8 disimpan di {output_path}")
+        return True
+    except Exception as e:
+        print(f"Error saat ekspor model ONNX: {e}")
+        return False
     
 # Contoh penggunaan dan testing
 if __name__ == "__main__":
@@ -1,10 +1,100 @@
+import logging
 import os
 import re
-import requests
-from typing import List, Dict, Optional
+import threading
 import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Dict, NamedTuple, Optional
 from html import unescape
 
+# orjson (opsional) mem-parsing respons API lebih cepat daripada modul json bawaan
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Endpoint YouTube Data API v3
+_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+_COMMENT_THREADS_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
+
+# Session HTTP bersama agar koneksi TLS ke googleapis.com dipakai ulang antar halaman
+REQUEST_TIMEOUT = 10
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept': 'application/json'})
+# Error sementara (rate limit, 5xx, koneksi putus) diulang dengan backoff eksponensial
+# agar scraping tidak gagal total. 403 (kuota habis) tidak diulang
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET'}),
+    raise_on_status=False,
+)
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=_RETRY))
+
+# Thread untuk mengambil halaman komentar berikutnya selagi halaman sekarang diproses
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='yt-fetch')
+
+class Comment(NamedTuple):
+    """Satu komentar YouTube. Gunakan _asdict() jika butuh bentuk dict."""
+    author: str
+    text: str
+    like_count: int
+    published_at: str
+
+# Pola regex dikompilasi sekali saat import
+_HTML_TAG_RE = re.compile(r'<[^>]+>', re.ASCII)
+# Entity yang umum di textDisplay YouTube. '&amp;' sengaja tidak ada di sini dan
+# diganti paling akhir agar '&amp;lt;' tidak ter-decode dua kali
+_COMMON_ENTITIES = (
+    ('&lt;', '<'),
+    ('&gt;', '>'),
+    ('&quot;', '"'),
+    ('&#39;', "'"),
+    ('&nbsp;', '\xa0'),
+)
+# Format URL YouTube: watch?v=, watch?...&v=, youtu.be/ dan embed/.
+# Video ID YouTube selalu 11 karakter [A-Za-z0-9_-]
+_YT_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/embed/)'
+    r'([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])',
+    re.ASCII
+)
+
+def _fast_unescape(text: str) -> str:
+    """
+    Decode HTML entity dengan str.replace untuk entity yang umum.
+    Jika masih ada entity lain (numerik atau bernama), html.unescape dipakai
+    pada teks asli sehingga hasilnya selalu sama dengan html.unescape.
+    
+    Args:
+        text (str): Teks dengan HTML entity
+        
+    Returns:
+        str: Teks yang sudah di-decode
+    """
+    if '&' not in text:
+        return text
+    
+    result = text
+    for entity, char in _COMMON_ENTITIES:
+        result = result.replace(entity, char)
+    
+    # Setiap '&' yang tersisa harus bagian dari '&amp;'
+    if result.count('&') != result.count('&amp;'):
+        return unescape(text)
+    return result.replace('&amp;', '&')
+
 def clean_html_text(text: str) -> str:
     """
     Membersihkan teks dari HTML tags.
@@ -18,16 +108,17 @@ def clean_html_text(text: str) -> str:
     if not text:
         return ""
     
-    # Unescape HTML entities
-    text = unescape(text)
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Clean up extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    # Sebagian besar komentar tanpa entity/tag, jadi cek karakter penanda dulu
+    if '&' in text:
+        text = _fast_unescape(text)
+    if '<' in text:
+        text = _HTML_TAG_RE.sub('', text)
+    
+    # Selain spasi, semua whitespace tidak printable; tanpa keduanya tidak ada yang perlu dirapikan
+    if text.isprintable() and '  ' not in text:
+        return text.strip()
+    # split() tanpa argumen memecah di semua whitespace Unicode, sama seperti \s+ lalu strip()
+    return ' '.join(text.split())
 
 def extract_video_id(url: str) -> Optional[str]:
     """
@@ -39,20 +130,95 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         str: Video ID atau None jika tidak valid
     """
-    # Pattern untuk berbagai format URL YouTube
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-        r'youtu\.be\/([^&\n?#]+)',
-        r'youtube\.com\/embed\/([^&\n?#]+)'
-    ]
+    match = _YT_ID_RE.search(url)
+    return match.group(1) if match else None
+
+def _decode_json(response: requests.Response) -> Dict:
+    """
+    Decode body respons JSON dengan _json_loads. Seperti response.json(), body yang
+    bukan JSON (misalnya halaman error HTML) dilempar sebagai requests.JSONDecodeError,
+    yang merupakan RequestException, sehingga ditangani handler error request yang sama.
+    """
+    try:
+        return _json_loads(response.content)
+    except ValueError as e:
+        raise requests.JSONDecodeError(getattr(e, 'msg', str(e)), getattr(e, 'doc', ''), getattr(e, 'pos', 0)) from e
+
+VIDEO_INFO_BATCH_SIZE = 50  # Batas jumlah ID per request endpoint videos
+
+# Cache info video: video_id -> (waktu diambil, info). Hanya hasil sukses yang disimpan
+VIDEO_INFO_CACHE_SIZE = 1024
+VIDEO_INFO_CACHE_TTL = 300  # detik
+_video_info_cache = OrderedDict()
+_video_info_lock = threading.Lock()
+
+def _parse_video_info(item: Dict) -> Dict:
+    """Mengambil field yang dipakai dari satu item respons endpoint videos."""
+    return {
+        'title': item['snippet']['title'],
+        'channel': item['snippet']['channelTitle'],
+        'view_count': item['statistics'].get('viewCount', 0),
+        'comment_count': item['statistics'].get('commentCount', 0)
+    }
+
+def get_video_infos(video_ids: List[str], api_key: str) -> Dict[str, Dict]:
+    """
+    Mendapatkan informasi beberapa video sekaligus dari YouTube API.
+    Endpoint videos menerima hingga 50 ID per request dengan biaya kuota yang sama,
+    sehingga ID digabung per 50 untuk menghemat request. Info yang berhasil diambil
+    di-cache selama VIDEO_INFO_CACHE_TTL detik.
     
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    Args:
+        video_ids (List[str]): List ID video YouTube
+        api_key (str): YouTube Data API key
+        
+    Returns:
+        Dict[str, Dict]: Mapping video ID ke informasi video. ID yang tidak
+        ditemukan atau gagal diambil tidak ada di hasil.
+    """
+    infos = {}
+    ids = []
+    
+    # Info yang masih dalam TTL tidak perlu diminta lagi ke API
+    now = time.monotonic()
+    with _video_info_lock:
+        for video_id in dict.fromkeys(video_ids):
+            entry = _video_info_cache.get(video_id)
+            if entry and now - entry[0] < VIDEO_INFO_CACHE_TTL:
+                _video_info_cache.move_to_end(video_id)
+                infos[video_id] = dict(entry[1])
+            else:
+                ids.append(video_id)
+    
+    for i in range(0, len(ids), VIDEO_INFO_BATCH_SIZE):
+        params = {
+            'part': 'snippet,statistics',
+            'id': ','.join(ids[i:i+VIDEO_INFO_BATCH_SIZE]),
+            'key': api_key
+        }
+        
+        try:
+            response = _SESSION.get(_VIDEOS_URL, params=params, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            data = _decode_json(response)
+            fetched = {item['id']: _parse_video_info(item) for item in data.get('items', [])}
+            
+        except requests.RequestException as e:
+            logger.error(f"Error saat mengambil info video: {e}")
+            continue
+        
+        now = time.monotonic()
+        with _video_info_lock:
+            for video_id, info in fetched.items():
+                _video_info_cache[video_id] = (now, info)
+                _video_info_cache.move_to_end(video_id)
+            while len(_video_info_cache) > VIDEO_INFO_CACHE_SIZE:
+                _video_info_cache.popitem(last=False)
+        
+        infos.update((video_id, dict(info)) for video_id, info in fetched.items())
     
-    return None
+    return infos
 
 def get_video_info(video_id: str, api_key: str) -> Optional[Dict]:
     """
@@ -65,106 +231,172 @@ def get_video_info(video_id: str, api_key: str) -> Optional[Dict]:
     Returns:
         Dict: Informasi video atau None jika error
     """
-    url = "https://www.googleapis.com/youtube/v3/videos"
+    return get_video_infos([video_id], api_key).get(video_id)
+
+def _fetch_comment_page(video_id: str, api_key: str, page_size: int, page_token: Optional[str] = None) -> Dict:
+    """
+    Mengambil satu halaman mentah commentThreads dari YouTube API.
+    
+    Args:
+        video_id (str): ID video YouTube
+        api_key (str): YouTube Data API key
+        page_size (int): Jumlah komentar yang diminta (maksimal 100)
+        page_token (str): Token halaman, None untuk halaman pertama
+        
+    Returns:
+        Dict: Respons JSON dari API
+    """
     params = {
-        'part': 'snippet,statistics',
-        'id': video_id,
-        'key': api_key
+        'part': 'snippet',
+        'videoId': video_id,
+        'maxResults': page_size,
+        'key': api_key,
+        'order': 'relevance'
     }
     
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data.get('items'):
-            video_info = data['items'][0]
-            return {
-                'title': video_info['snippet']['title'],
-                'channel': video_info['snippet']['channelTitle'],
-                'view_count': video_info['statistics'].get('viewCount', 0),
-                'comment_count': video_info['statistics'].get('commentCount', 0)
-            }
-        
-    except requests.RequestException as e:
-        print(f"Error saat mengambil info video: {e}")
+    if page_token:
+        params['pageToken'] = page_token
     
-    return None
+    response = _SESSION.get(_COMMENT_THREADS_URL, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return _decode_json(response)
+
+def _submit_comment_page(video_id: str, api_key: str, page_size: int, page_token: Optional[str] = None) -> Future:
+    """Menjadwalkan _fetch_comment_page di thread terpisah."""
+    return _FETCH_EXECUTOR.submit(_fetch_comment_page, video_id, api_key, page_size, page_token)
 
-def get_comments(video_id: str, api_key: str, max_results: int = 100) -> List[Dict]:
+def iter_comment_pages(video_id: str, api_key: str, max_results: int = 100,
+                       first_page: Optional[Future] = None) -> Iterator[List[Comment]]:
     """
-    Mengambil komentar dari video YouTube.
+    Mengambil komentar dari video YouTube per halaman API.
+    Generator ini menghasilkan list komentar setiap kali satu halaman selesai diambil,
+    sehingga pemanggil dapat mulai memproses komentar sebelum semua halaman terkumpul.
+    Halaman berikutnya sudah diminta sebelum halaman sekarang diproses, sehingga
+    waktu tunggu jaringan tertutup oleh parsing dan pemrosesan di sisi pemanggil.
     
     Args:
         video_id (str): ID video YouTube
         api_key (str): YouTube Data API key
         max_results (int): Jumlah maksimal komentar yang diambil
+        first_page (Future): Permintaan halaman pertama yang sudah berjalan (opsional)
         
-    Returns:
-        List[Dict]: List komentar dengan informasi
+    Yields:
+        List[Comment]: List komentar dalam satu halaman
     """
-    comments = []
-    next_page_token = None
+    if max_results <= 0:
+        return
+    
+    total = 0
+    pending = first_page or _submit_comment_page(video_id, api_key, min(100, max_results))
     
     try:
-        while len(comments) < max_results:
-            url = "https://www.googleapis.com/youtube/v3/commentThreads"
-            params = {
-                'part': 'snippet',
-                'videoId': video_id,
-                'maxResults': min(100, max_results - len(comments)),
-                'key': api_key,
-                'order': 'relevance'
-            }
-            
-            if next_page_token:
-                params['pageToken'] = next_page_token
+        while pending is not None:
+            data = pending.result()
+            items = data.get('items', [])[:max_results - total]
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            for item in data.get('items', []):
-                comment = item['snippet']['topLevelComment']['snippet']
-                
-                # Clean HTML from textDisplay
-                clean_text = clean_html_text(comment['textDisplay'])
-                
-                comments.append({
-                    'author': comment['authorDisplayName'],
-                    'text': clean_text,
-                    'like_count': comment['likeCount'],
-                    'published_at': comment['publishedAt']
-                })
-            
-            # Cek apakah ada halaman berikutnya
+            # Minta halaman berikutnya dulu, baru proses halaman ini
             next_page_token = data.get('nextPageToken')
-            if not next_page_token:
-                break
+            remaining = max_results - total - len(items)
+            pending = None
+            if next_page_token and remaining > 0:
+                pending = _submit_comment_page(video_id, api_key, min(100, remaining), next_page_token)
+            
+            # Clean HTML from textDisplay
+            page = [Comment(
+                comment['authorDisplayName'],
+                clean_html_text(comment['textDisplay']),
+                comment['likeCount'],
+                comment['publishedAt']
+            ) for item in items
+              for comment in (item['snippet']['topLevelComment']['snippet'],)]
             
-            # Delay untuk menghindari rate limiting
-            time.sleep(0.1)
+            total += len(page)
+            if page:
+                yield page
             
     except requests.RequestException as e:
-        print(f"Error saat mengambil komentar: {e}")
+        logger.error(f"Error saat mengambil komentar: {e}")
+
+def iter_comments(video_id: str, api_key: str, max_results: int = 100,
+                  first_page: Optional[Future] = None) -> Iterator[Comment]:
+    """
+    Mengambil komentar dari video YouTube satu per satu.
+    Komentar dihasilkan segera setelah halamannya tiba, tanpa menunggu semua halaman.
+    
+    Args:
+        video_id (str): ID video YouTube
+        api_key (str): YouTube Data API key
+        max_results (int): Jumlah maksimal komentar yang diambil
+        first_page (Future): Permintaan halaman pertama yang sudah berjalan (opsional)
+        
+    Yields:
+        Comment: Satu komentar dengan informasi
+    """
+    for page in iter_comment_pages(video_id, api_key, max_results, first_page):
+        yield from page
+
+def get_comments(video_id: str, api_key: str, max_results: int = 100,
+                 first_page: Optional[Future] = None) -> List[Comment]:
+    """
+    Mengambil komentar dari video YouTube.
     
-    return comments[:max_results]
+    Args:
+        video_id (str): ID video YouTube
+        api_key (str): YouTube Data API key
+        max_results (int): Jumlah maksimal komentar yang diambil
+        first_page (Future): Permintaan halaman pertama yang sudah berjalan (opsional)
+        
+    Returns:
+        List[Comment]: List komentar dengan informasi
+    """
+    return list(iter_comments(video_id, api_key, max_results, first_page))
+
+def get_comments_columnar(video_id: str, api_key: str, max_results: int = 100,
+                          first_page: Optional[Future] = None) -> Dict[str, List]:
+    """
+    Mengambil komentar dari video YouTube dalam bentuk kolom (satu list per field),
+    siap dipakai langsung oleh pd.DataFrame tanpa inferensi dari list of dict.
+    
+    Args:
+        video_id (str): ID video YouTube
+        api_key (str): YouTube Data API key
+        max_results (int): Jumlah maksimal komentar yang diambil
+        first_page (Future): Permintaan halaman pertama yang sudah berjalan (opsional)
+        
+    Returns:
+        Dict[str, List]: Mapping nama field Comment ke list nilainya
+    """
+    columns = {field: [] for field in Comment._fields}
+    for page in iter_comment_pages(video_id, api_key, max_results, first_page):
+        # zip(*page) mentranspos satu halaman Comment menjadi tuple per kolom
+        for field, values in zip(Comment._fields, zip(*page)):
+            columns[field].extend(values)
+    
+    return columns
+
+_api_key = None  # API key yang sudah ditemukan, dipakai ulang antar pemanggilan
 
 def get_api_key() -> Optional[str]:
     """
-    Mendapatkan API key
+    Mendapatkan API key.
+    Key yang ditemukan disimpan sehingga environment dan .env hanya dibaca sekali.
+    Jika key belum ada, pencarian diulang pada pemanggilan berikutnya.
     
     Returns:
         str: API key atau None jika tidak ditemukan
     """
+    global _api_key
+    
+    if _api_key:
+        return _api_key
+    
     # Coba berbagai cara untuk mendapatkan API key
-    api_key = None
     
     # dari environment variable
     api_key = os.getenv('YOUTUBE_API_KEY')
     if api_key:
-        print("API key ditemukan dari environment variable")
+        logger.info("API key ditemukan dari environment variable")
+        _api_key = api_key
         return api_key
     
     # Coba dari .env file
@@ -173,25 +405,28 @@ def get_api_key() -> Optional[str]:
         load_dotenv()
         api_key = os.getenv('YOUTUBE_API_KEY')
         if api_key:
-            print("API key ditemukan dari .env file")
+            logger.info("API key ditemukan dari .env file")
+            _api_key = api_key
             return api_key
     except ImportError:
-        print("dotenv tidak tersedia, skip loading .env file")
+        logger.info("dotenv tidak tersedia, skip loading .env file")
     
-    print("❌ API key tidak ditemukan")
-    print("Pastikan YOUTUBE_API_KEY tersedia di environment variable atau .env file")
+    logger.error("❌ API key tidak ditemukan")
+    logger.error("Pastikan YOUTUBE_API_KEY tersedia di environment variable atau .env file")
     return None
 
-def scrape_youtube_comments(video_url: str, max_comments: int = 100) -> Dict:
+def _resolve_video(video_url: str, max_comments: int = 0) -> Dict:
     """
-    Scraping komentar dari video YouTube berdasarkan URL.
+    Memvalidasi API key dan URL, lalu mengambil informasi video.
+    Jika max_comments > 0, halaman komentar pertama diminta lebih dulu sehingga
+    berjalan bersamaan dengan pengambilan info video.
     
     Args:
         video_url (str): URL video YouTube
-        max_comments (int): Jumlah maksimal komentar yang diambil
+        max_comments (int): Jumlah maksimal komentar yang akan diambil
         
     Returns:
-        Dict: Hasil scraping dengan info video dan komentar
+        Dict: Info video beserta api_key, video_id dan first_page, atau pesan error
     """
     # Ambil API key
     api_key = get_api_key()
@@ -209,25 +444,144 @@ def scrape_youtube_comments(video_url: str, max_comments: int = 100) -> Dict:
             'error': 'URL video YouTube tidak valid'
         }
     
+    # Halaman komentar pertama berjalan di thread lain selagi info video diambil
+    first_page = None
+    if max_comments > 0:
+        first_page = _submit_comment_page(video_id, api_key, min(100, max_comments))
+    
     # Ambil info video
     video_info = get_video_info(video_id, api_key)
     if not video_info:
+        if first_page is not None:
+            first_page.cancel()
         return {
             'success': False,
             'error': 'Tidak dapat mengambil informasi video'
         }
     
-    # Ambil komentar
-    comments = get_comments(video_id, api_key, max_comments)
-    
     return {
         'success': True,
+        'api_key': api_key,
         'video_id': video_id,
         'video_info': video_info,
+        'first_page': first_page
+    }
+
+def scrape_youtube_comments(video_url: str, max_comments: int = 100, columnar: bool = False) -> Dict:
+    """
+    Scraping komentar dari video YouTube berdasarkan URL.
+    
+    Args:
+        video_url (str): URL video YouTube
+        max_comments (int): Jumlah maksimal komentar yang diambil
+        columnar (bool): Jika True, 'comments' berisi dict kolom dari get_comments_columnar
+        
+    Returns:
+        Dict: Hasil scraping dengan info video dan komentar
+    """
+    video = _resolve_video(video_url, max_comments)
+    if not video['success']:
+        return video
+    
+    # Ambil komentar
+    if columnar:
+        comments = get_comments_columnar(video['video_id'], video['api_key'], max_comments, video['first_page'])
+        total_comments = len(comments['text'])
+    else:
+        comments = get_comments(video['video_id'], video['api_key'], max_comments, video['first_page'])
+        total_comments = len(comments)
+    
+    return {
+        'success': True,
+        'video_id': video['video_id'],
+        'video_info': video['video_info'],
         'comments': comments,
-        'total_comments': len(comments)
+        'total_comments': total_comments
     }
 
+def scrape_youtube_comments_iter(video_url: str, max_comments: int = 100, chunk_size: int = 20) -> Dict:
+    """
+    Seperti scrape_youtube_comments, tetapi komentar dikembalikan sebagai generator chunk.
+    Info video diambil di awal, sedangkan komentar baru diambil saat generator diiterasi,
+    sehingga pemrosesan chunk pertama bisa berjalan selagi halaman berikutnya diambil.
+    
+    Args:
+        video_url (str): URL video YouTube
+        max_comments (int): Jumlah maksimal komentar yang diambil
+        chunk_size (int): Jumlah komentar per chunk
+        
+    Returns:
+        Dict: Hasil scraping dengan info video dan generator 'comment_chunks'
+    """
+    video = _resolve_video(video_url, max_comments)
+    if not video['success']:
+        return video
+    
+    def comment_chunks() -> Iterator[List[Comment]]:
+        for page in iter_comment_pages(video['video_id'], video['api_key'], max_comments, video['first_page']):
+            for i in range(0, len(page), chunk_size):
+                yield page[i:i+chunk_size]
+    
+    return {
+        'success': True,
+        'video_id': video['video_id'],
+        'video_info': video['video_info'],
+        'comment_chunks': comment_chunks()
+    }
+
+def scrape_youtube_comments_batch(video_urls: List[str], max_comments: int = 100) -> Dict[str, Dict]:
+    """
+    Scraping komentar dari beberapa video YouTube sekaligus.
+    Info semua video diambil dengan get_video_infos (satu request per 50 video),
+    lalu komentar tiap video diambil seperti pada scrape_youtube_comments.
+    
+    Args:
+        video_urls (List[str]): List URL video YouTube
+        max_comments (int): Jumlah maksimal komentar yang diambil per video
+        
+    Returns:
+        Dict[str, Dict]: Mapping URL ke hasil scraping dengan format yang sama
+        seperti scrape_youtube_comments
+    """
+    api_key = get_api_key()
+    if not api_key:
+        error = {
+            'success': False,
+            'error': 'YouTube API key tidak ditemukan. Pastikan YOUTUBE_API_KEY tersedia di environment variable atau .env file.'
+        }
+        return {video_url: dict(error) for video_url in video_urls}
+    
+    video_ids = {video_url: extract_video_id(video_url) for video_url in video_urls}
+    video_infos = get_video_infos([vid for vid in video_ids.values() if vid], api_key)
+    
+    results = {}
+    for video_url, video_id in video_ids.items():
+        if not video_id:
+            results[video_url] = {
+                'success': False,
+                'error': 'URL video YouTube tidak valid'
+            }
+            continue
+        
+        video_info = video_infos.get(video_id)
+        if not video_info:
+            results[video_url] = {
+                'success': False,
+                'error': 'Tidak dapat mengambil informasi video'
+            }
+            continue
+        
+        comments = get_comments(video_id, api_key, max_comments)
+        results[video_url] = {
+            'success': True,
+            'video_id': video_id,
+            'video_info': video_info,
+            'comments': comments,
+            'total_comments': len(comments)
+        }
+    
+    return results
+
 def get_comment_texts(video_url: str, max_comments: int = 100) -> List[str]:
     """
     Mengambil hanya teks komentar dari video YouTube.
@@ -239,18 +593,20 @@ def get_comment_texts(video_url: str, max_comments: int = 100) -> List[str]:
     Returns:
         List[str]: List teks komentar
     """
-    result = scrape_youtube_comments(video_url, max_comments)
+    video = _resolve_video(video_url, max_comments)
     
-    if not result['success']:
-        print(f"Error: {result['error']}")
+    if not video['success']:
+        logger.error(f"Error: {video['error']}")
         return []
     
-    # Ekstrak hanya teks komentar
-    comment_texts = [comment['text'] for comment in result['comments']]
-    return comment_texts
+    # Ekstrak hanya teks komentar, tanpa list komentar perantara
+    comments = iter_comments(video['video_id'], video['api_key'], max_comments, video['first_page'])
+    return [comment.text for comment in comments]
 
 # Contoh penggunaan dan testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Test HTML cleaning
     print("=== Test HTML Cleaning ===")
     test_html_texts = [
@@ -304,7 +660,7 @@ if __name__ == "__main__":
             print("\nKomentar:")
             
             for i, comment in enumerate(result['comments'][:5], 1):
-                print(f"{i}. {comment['author']}: {comment['text'][:100]}...")
+                print(f"{i}. {comment.author}: {comment.text[:100]}...")
         else:
             print(f"Error: {result['error']}")
             